@@ -0,0 +1,140 @@
+#!/usr/bin/env zsh
+
+# Benchmark interactive zsh startup. Two numbers per run:
+#   first prompt   time until the first prompt could draw
+#   fully loaded   first prompt plus zinit's turbo queue (deferred plugins and
+#                  compinit), flushed with `@zinit-scheduler burst`
+#
+#   ./bench-zsh.sh                 10 timed runs + zprof breakdown
+#   ./bench-zsh.sh --runs=50       more runs for a steadier median
+#   ./bench-zsh.sh --max-ms=150    exit 1 if the first-prompt median exceeds 150ms
+#   ./bench-zsh.sh --no-profile    timings only
+#   ./bench-zsh.sh --zdotdir=DIR   benchmark the startup files in DIR instead,
+#                                  e.g. a baseline checkout's zsh/ directory
+
+zmodload zsh/datetime
+zmodload zsh/mathfunc
+
+# Color definitions
+GREEN='\033[0;32m'
+RED='\033[0;31m'
+RESET='\033[0m'
+
+error() {
+    printf "${RED}[ERROR]${RESET} %s\n" "$1" >&2
+}
+
+RUNS=10
+MAX_MS=""
+TOP=20
+PROFILE=true
+ZDOTDIR_ARG=""
+
+for arg in "$@"; do
+    case "$arg" in
+        --runs=*)
+            RUNS="${arg#--runs=}"
+            ;;
+        --max-ms=*)
+            MAX_MS="${arg#--max-ms=}"
+            ;;
+        --top=*)
+            TOP="${arg#--top=}"
+            ;;
+        --no-profile)
+            PROFILE=false
+            ;;
+        --zdotdir=*)
+            ZDOTDIR_ARG="${arg#--zdotdir=}"
+            ;;
+        *)
+            error "Unknown flag: $arg"
+            exit 1
+            ;;
+    esac
+done
+
+if [[ $RUNS != <1-> || $TOP != <1-> || ( -n $MAX_MS && $MAX_MS != <1-> ) ]]; then
+    error "--runs, --top and --max-ms expect positive integers"
+    exit 1
+fi
+
+if [[ -n $ZDOTDIR_ARG ]]; then
+    if [[ ! -f $ZDOTDIR_ARG/.zshrc ]]; then
+        error "No .zshrc in --zdotdir=$ZDOTDIR_ARG"
+        exit 1
+    fi
+    export ZDOTDIR="${ZDOTDIR_ARG:A}"
+    printf "Startup files: %s\n\n" "$ZDOTDIR"
+fi
+
+# Login + interactive, like a new terminal or tmux pane. The optional command
+# runs after .zshrc, e.g. to flush the turbo queue.
+start_shell() {
+    zsh -lic "${1:-exit}" >/dev/null 2>&1 </dev/null
+}
+
+FLUSH_TURBO='@zinit-scheduler burst'
+
+# Warm-up run so one-off work (zinit clones, .zwc compiles) isn't counted
+start_shell "$FLUSH_TURBO"
+
+# Time RUNS starts of `start_shell $1`; print min/median/mean/max under the
+# label $2 and leave the median (microseconds) in $median
+measure() {
+    local cmd=$1 label=$2 i start sample total=0
+    # Durations in integer microseconds so numeric sorting is exact
+    local -a samples sorted
+    for i in {1..$RUNS}; do
+        start=$EPOCHREALTIME
+        start_shell "$cmd"
+        samples+=$(( int((EPOCHREALTIME - start) * 1e6) ))
+    done
+
+    sorted=(${(on)samples})
+    for sample in $sorted; do
+        (( total += sample ))
+    done
+
+    if (( RUNS % 2 )); then
+        median=$sorted[$(( RUNS / 2 + 1 ))]
+    else
+        median=$(( (sorted[RUNS / 2] + sorted[RUNS / 2 + 1]) / 2 ))
+    fi
+
+    printf "%s over %d runs (ms):\n" "$label" $RUNS
+    printf "  min    %8.1f\n" $(( sorted[1] / 1000.0 ))
+    printf "  median %8.1f\n" $(( median / 1000.0 ))
+    printf "  mean   %8.1f\n" $(( total / 1000.0 / RUNS ))
+    printf "  max    %8.1f\n" $(( sorted[-1] / 1000.0 ))
+}
+
+measure "$FLUSH_TURBO" "fully loaded (turbo queue flushed)"
+printf "\n"
+measure exit "first prompt"
+prompt_median=$median
+
+if [[ $PROFILE == true ]]; then
+    printf "\nzprof, top %d by self time (one run, turbo queue flushed):\n" $TOP
+    # .zshrc prints zprof before the turbo queue runs; the second zprof call
+    # covers startup plus the flushed queue, so keep only the last table
+    # (up to its first blank line), which zprof sorts by total time, and
+    # re-sort it by self ms (column 6)
+    ZSH_PROFILE=1 zsh -lic "$FLUSH_TURBO; zprof" 2>/dev/null </dev/null \
+        | awk '/^num +calls/ { table = 1; n = 0; getline; next }
+               table && !NF { table = 0 }
+               table { rows[++n] = $0 }
+               END { for (i = 1; i <= n; i++) print rows[i] }' \
+        | sort -k6,6 -rn \
+        | head -n $TOP
+
+    printf "\nzinit load time per plugin/snippet, eager and turbo:\n"
+    zsh -lic "$FLUSH_TURBO; zinit times" 2>/dev/null </dev/null
+fi
+
+if [[ -n $MAX_MS ]] && (( prompt_median > MAX_MS * 1000 )); then
+    printf "\n${RED}FAIL${RESET} first-prompt median %.1fms exceeds --max-ms=%d\n" $(( prompt_median / 1000.0 )) $MAX_MS
+    exit 1
+elif [[ -n $MAX_MS ]]; then
+    printf "\n${GREEN}OK${RESET} first-prompt median within --max-ms=%d\n" $MAX_MS
+fi
@@ -0,0 +1,705 @@
+#!/usr/bin/env python3
+"""Declaration -> reference index for dead-code audits of JVM projects.
+
+Searching the whole tree separately for every candidate class, method and
+endpoint costs O(candidates x files). This script instead parses every Java
+and Kotlin source once, plus the resources that reflection and Spring wiring
+read. The result is a SQLite index, and each "who references X" question
+becomes an indexed lookup.
+
+    python3 ref_index.py build  [--root DIR] [--jobs N]
+    python3 ref_index.py update [--root DIR] [--jobs N]
+    python3 ref_index.py query  NAME [--exclude-tests] [--json]
+    python3 ref_index.py query  --unreferenced [--kind class|method] [--exclude-tests] [--json]
+
+``build`` parses the project in one parallel pass and records the git commit
+it indexed. ``update`` re-parses only the files that ``git diff --name-only``
+reports changed since that commit, plus files that were dirty or untracked at
+the last build or update. ``--root`` may be a subdirectory of the git work
+tree (one service in a monorepo); paths are kept relative to it.
+
+What the index holds:
+
+- declarations: types (nested ones qualified by their outer types) and
+  methods/functions with file, line, enclosing type, annotations, and whether they are framework entry points. Entry points are
+  Spring stereotypes, mappings, listeners, schedulers, ``main`` and tests.
+  Endpoints carry their HTTP method and path.
+- references: every identifier occurrence in code (kind ``code``), except a
+  type's own constructor declarations.
+  Reflection hints are kept apart from code references. String literals
+  holding fully qualified names, or passed to reflective APIs such as
+  ``Class.forName``, ``getMethod`` and ``getBean``, are kind ``reflection``.
+  Other identifier-like string literals are kind ``string``. Names in XML,
+  YAML, properties, ``spring.factories``, ``*.imports`` and reflection
+  config JSON are kind ``resource``.
+
+References match by simple name, so overloads and same-named members of
+different types share hits. That over-approximates liveness: a name with no
+hits is a strong dead-code candidate, and a name with hits still needs the
+usual verification.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+INDEX_VERSION = 2
+DEFAULT_INDEX = Path(".dead-code-audit") / "ref-index.sqlite"
+
+SOURCE_SUFFIXES = {".java", ".kt", ".kts"}
+RESOURCE_SUFFIXES = {".xml", ".yml", ".yaml", ".properties", ".json", ".factories", ".imports"}
+SKIP_DIRS = {".git", ".gradle", ".idea", ".dead-code-audit", "build", "out", "target", "node_modules"}
+MAX_RESOURCE_BYTES = 1_000_000
+
+# Hard keywords only: Kotlin soft keywords (get, set, data, ...) are common member names
+KEYWORDS = set("""
+abstract assert boolean break byte case catch char class const continue default do double else enum
+extends final finally float for goto if implements import instanceof int interface long native new
+package private protected public return short static strictfp super switch synchronized this throw
+throws transient try void volatile while true false null fun val var object when typealias
+""".split())
+
+# Annotations that make the framework, not our code, call the declaration
+ENTRY_POINT_ANNOTATIONS = {
+    "SpringBootApplication", "Configuration", "AutoConfiguration", "Bean", "Component", "Service",
+    "Repository", "Controller", "RestController", "ControllerAdvice", "RestControllerAdvice",
+    "RequestMapping", "GetMapping", "PostMapping", "PutMapping", "PatchMapping", "DeleteMapping",
+    "ExceptionHandler", "InitBinder", "ModelAttribute", "MessageMapping", "SubscribeMapping",
+    "Scheduled", "Async", "EventListener", "TransactionalEventListener", "KafkaListener",
+    "KafkaHandler", "RabbitListener", "RabbitHandler", "JmsListener", "SqsListener", "StreamListener",
+    "PostConstruct", "PreDestroy", "ConfigurationProperties", "ConditionalOnProperty",
+    "ConditionalOnClass", "ConditionalOnBean", "ConditionalOnMissingBean", "Endpoint",
+    "ReadOperation", "WriteOperation", "DeleteOperation", "Converter", "JsonCreator",
+    "JsonComponent", "Entity", "Embeddable", "MappedSuperclass", "Aspect",
+    "Around", "Before", "After", "AfterReturning", "AfterThrowing", "Pointcut",
+    "Test", "ParameterizedTest", "RepeatedTest", "TestFactory", "BeforeEach", "AfterEach",
+    "BeforeAll", "AfterAll", "SpringBootTest", "WebMvcTest", "DataJpaTest", "TestConfiguration",
+}
+# A type declaring one of these is run by the test engine even without a class annotation
+TEST_ANNOTATIONS = {"Test", "ParameterizedTest", "RepeatedTest", "TestFactory"}
+MAPPING_METHODS = {
+    "GetMapping": "GET", "PostMapping": "POST", "PutMapping": "PUT",
+    "PatchMapping": "PATCH", "DeleteMapping": "DELETE", "RequestMapping": "ANY",
+}
+REFLECTIVE_CALLS = re.compile(
+    r"\b(?:forName|loadClass|getMethod|getDeclaredMethod|getField|getDeclaredField|getBean|"
+    r"invokeMethod|setField|getConstructor|findMethod|findField)\s*\(\s*(?:[\w.]+\s*,\s*)?$"
+)
+
+PACKAGE = re.compile(r"^\s*package\s+([\w.]+)", re.M)
+TYPE_DECL = re.compile(r"(?<![\w@.])(?:@interface|class|interface|enum|record|object)\s+([A-Z][\w$]*)")
+JAVA_METHOD = re.compile(r"([\w\]>?])\s+([a-z_$][\w$]*)\s*\(")
+KOTLIN_FUN = re.compile(r"\bfun\s+(?:<[^>]*>\s*)?(?:[\w.<>?]+\.)?([A-Za-z_][\w]*)\s*\(")
+ANNOTATION = re.compile(r"@([A-Z][\w]*)(?:\s*\(([^()]*(?:\([^()]*\)[^()]*)*)\))?")
+IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+QUALIFIED_NAME = re.compile(r"^(?:[a-z_][\w]*\.)+([A-Z][\w$]*)(?:[#.:]([a-z_][\w]*))?$")
+BARE_NAME = re.compile(r"^[A-Za-z_][\w]{2,}$")
+MODIFIERS_ONLY = re.compile(r"^[\s\w$<>,.?\[\]]*$")
+NOT_A_METHOD = {"return", "new", "else", "throw", "case", "yield", "await", "assert", "in", "is", "as", "typeof"}
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+RESET = "\033[0m"
+
+
+def error(message):
+    print(f"{RED}[ERROR]{RESET} {message}", file=sys.stderr)
+    sys.exit(1)
+
+
+# ---------------------------------------------------------------------------
+# Parsing (runs in worker processes)
+# ---------------------------------------------------------------------------
+
+def lex(text):
+    """Blank out comments and string contents, keeping offsets and newlines intact.
+
+    Returns ``(code, no_comments, strings)``. ``code`` has comments and string
+    contents replaced by spaces. ``no_comments`` keeps strings and blanks only
+    comments. ``strings`` is a list of ``(value, offset)`` pairs.
+    """
+    code = list(text)
+    keep = list(text)
+    strings = []
+    i, n = 0, len(text)
+
+    def blank(buffer, start, end):
+        for j in range(start, end):
+            if buffer[j] != "\n":
+                buffer[j] = " "
+
+    while i < n:
+        c = text[i]
+        if text.startswith("//", i):
+            end = text.find("\n", i)
+            end = n if end == -1 else end
+            blank(code, i, end)
+            blank(keep, i, end)
+            i = end
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            end = n if end == -1 else end + 2
+            blank(code, i, end)
+            blank(keep, i, end)
+            i = end
+        elif text.startswith('"""', i):
+            end = text.find('"""', i + 3)
+            end = n if end == -1 else end + 3
+            strings.append((text[i + 3:end - 3], i))
+            blank(code, i + 3, end - 3)
+            i = end
+        elif c in "\"'":
+            j = i + 1
+            while j < n and text[j] != c and text[j] != "\n":
+                j += 2 if text[j] == "\\" else 1
+            end = min(j + 1, n)
+            if c == '"':
+                strings.append((text[i + 1:j], i))
+            blank(code, i + 1, max(i + 1, end - 1))
+            i = end
+        else:
+            i += 1
+    return "".join(code), "".join(keep), strings
+
+
+class LineIndex:
+    def __init__(self, text):
+        self.starts = [0] + [m.end() for m in re.finditer("\n", text)]
+
+    def line(self, offset):
+        lo, hi = 0, len(self.starts) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.starts[mid] <= offset:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo + 1
+
+
+def closing_paren(code, open_at):
+    depth = 0
+    for i in range(open_at, len(code)):
+        if code[i] == "(":
+            depth += 1
+        elif code[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+    return -1
+
+
+def matching_brace(code, open_at):
+    depth = 0
+    for i in range(open_at, len(code)):
+        if code[i] == "{":
+            depth += 1
+        elif code[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(code) - 1
+
+
+def type_body(code, start, kotlin):
+    """Return the ``(open, close)`` brace offsets of the body of the type whose
+    header starts at ``start`` (just after its name), or None if it has no body.
+
+    Skips generics, a primary constructor and the supertype list. Kotlin types
+    may end without a body at a newline (``object Registry``), so there a
+    newline ends the header unless the next line continues it.
+    """
+    depth = 0
+    for i in range(start, len(code)):
+        c = code[i]
+        if c in "(<[":
+            depth += 1
+        elif c in ")>]":
+            depth = max(0, depth - 1)
+        elif depth:
+            continue
+        elif c == "{":
+            return i, matching_brace(code, i)
+        elif c in ";}=":
+            return None
+        elif kotlin and c == "\n":
+            rest = code[i:].lstrip()
+            if not (rest.startswith(("{", ":", ",", "where")) or code[start:i].rstrip().endswith((":", ","))):
+                return None
+    return None
+
+
+def constructor_offsets(code, name, body):
+    """Offsets of Java constructor declarations named ``name`` inside ``body``.
+
+    A constructor is ``Name(...)`` followed by ``{`` or ``throws``, or a record's
+    compact ``public Name {``. ``new Name(...)`` is a use, not a declaration.
+    """
+    offsets = set()
+    open_at, close_at = body
+    for match in re.finditer(rf"(?<![\w$.]){re.escape(name)}\s*([({{])", code[open_at:close_at]):
+        at = open_at + match.start()
+        preceding = re.search(r"([\w$]+)\s*$", code[:at])
+        word = preceding.group(1) if preceding else ""
+        if word in NOT_A_METHOD:
+            continue
+        if match.group(1) == "{":
+            if word in ("public", "private", "protected"):
+                offsets.add(at)
+            continue
+        close = closing_paren(code, open_at + match.start(1))
+        after = code[close + 1: close + 200].lstrip() if close != -1 else ""
+        if after.startswith(("{", "throws")):
+            offsets.add(at)
+    return offsets
+
+
+def annotations_before(code, keep, start):
+    """Annotations directly in front of the declaration at ``start``.
+
+    Walks back from the declaration over annotations separated only by
+    modifiers, types and whitespace. Kotlin statements need no ``;``, so the
+    previous member's annotations sit behind an expression and are not taken.
+    """
+    boundary = max(code.rfind(ch, 0, start) for ch in ";{}") + 1
+    found = list(ANNOTATION.finditer(keep, boundary, start))
+    annotations = []
+    end = start
+    for match in reversed(found):
+        if not MODIFIERS_ONLY.match(code[match.end():end]):
+            break
+        annotations.append((match.group(1), match.group(2) or ""))
+        end = match.start()
+    return annotations[::-1]
+
+
+def mapping_path(args):
+    match = re.search(r'"([^"]*)"', args)
+    return match.group(1) if match else ""
+
+
+def endpoint_for(annotations, class_prefix):
+    for name, args in annotations:
+        if name in MAPPING_METHODS:
+            method = MAPPING_METHODS[name]
+            verb = re.search(r"RequestMethod\.(\w+)", args)
+            if verb:
+                method = verb.group(1)
+            path = "/" + "/".join(p.strip("/") for p in (class_prefix, mapping_path(args)) if p.strip("/"))
+            return f"{method} {path}"
+    return None
+
+
+def parse_source(path, text):
+    code, keep, strings = lex(text)
+    lines = LineIndex(text)
+    kotlin = path.suffix in (".kt", ".kts")
+    package_match = PACKAGE.search(code)
+    package = package_match.group(1) if package_match else ""
+
+    decls = []
+    types = []  # {"decl", "body", "prefix"}, in source order so outer types come first
+
+    def enclosing_type(offset):
+        """Innermost type whose body contains ``offset``."""
+        inside = [t for t in types if t["body"] and t["body"][0] < offset <= t["body"][1]]
+        return max(inside, key=lambda t: t["body"][0]) if inside else None
+
+    for match in TYPE_DECL.finditer(code):
+        name = match.group(1)
+        annotations = annotations_before(code, keep, match.start())
+        names = [a for a, _ in annotations]
+        outer = enclosing_type(match.start())
+        decl = {
+            "name": name,
+            "kind": "class",
+            "line": lines.line(match.start(1)),
+            "parent": outer["decl"]["name"] if outer else "",
+            "fqn": ".".join(p for p in (outer["decl"]["fqn"] if outer else package, name) if p),
+            "annotations": names,
+            "entry_point": bool(ENTRY_POINT_ANNOTATIONS.intersection(names)),
+            "endpoint": None,
+        }
+        decls.append(decl)
+        types.append({
+            "decl": decl,
+            "body": type_body(code, match.end(), kotlin),
+            "prefix": next((mapping_path(args) for a, args in annotations if a == "RequestMapping"), ""),
+        })
+
+    method_matches = []
+    if kotlin:
+        method_matches = [(m.start(), m.start(1), m.group(1)) for m in KOTLIN_FUN.finditer(code)]
+    else:
+        for m in JAVA_METHOD.finditer(code):
+            preceding = re.search(r"([\w$]+)\s*$", code[: m.start(2)])
+            if preceding and preceding.group(1) in NOT_A_METHOD:
+                continue
+            if m.group(2) in KEYWORDS:
+                continue
+            close = closing_paren(code, code.index("(", m.end(2)))
+            after = code[close + 1: close + 200].lstrip() if close != -1 else ""
+            if not (after.startswith("{") or after.startswith(";") or after.startswith("throws")
+                    or after.startswith("default")):
+                continue
+            method_matches.append((m.start(2), m.start(2), m.group(2)))
+
+    for start, name_at, name in method_matches:
+        annotations = annotations_before(code, keep, start)
+        names = [a for a, _ in annotations]
+        owner = enclosing_type(start)
+        decls.append({
+            "name": name,
+            "kind": "method",
+            "line": lines.line(name_at),
+            "parent": owner["decl"]["name"] if owner else "",
+            "fqn": ".".join(p for p in (owner["decl"]["fqn"] if owner else package, name) if p),
+            "annotations": names,
+            "entry_point": bool(ENTRY_POINT_ANNOTATIONS.intersection(names)) or name == "main",
+            "endpoint": endpoint_for(annotations, owner["prefix"] if owner else ""),
+        })
+
+    test_types = {d["parent"] for d in decls if TEST_ANNOTATIONS.intersection(d["annotations"])}
+    for d in decls:
+        if d["kind"] == "class" and d["name"] in test_types:
+            d["entry_point"] = True
+
+    # A type names itself in its constructors; those are not uses of the type
+    constructors = set()
+    if not kotlin:
+        for t in types:
+            if t["body"]:
+                constructors |= constructor_offsets(code, t["decl"]["name"], t["body"])
+
+    refs = set()
+    for match in IDENTIFIER.finditer(code):
+        name = match.group(0)
+        if len(name) > 2 and name not in KEYWORDS and match.start() not in constructors:
+            refs.add((name, lines.line(match.start()), "code"))
+
+    for value, offset in strings:
+        value = value.strip()
+        line = lines.line(offset)
+        qualified = QUALIFIED_NAME.match(value)
+        if qualified:
+            refs.add((qualified.group(1), line, "reflection"))
+            if qualified.group(2):
+                refs.add((qualified.group(2), line, "reflection"))
+        elif BARE_NAME.match(value):
+            reflective = REFLECTIVE_CALLS.search(code[max(0, offset - 120): offset])
+            refs.add((value, line, "reflection" if reflective else "string"))
+
+    return decls, refs
+
+
+def parse_resource(text):
+    refs = set()
+    for number, line in enumerate(text.splitlines(), start=1):
+        for token in re.findall(r"[A-Za-z_$][\w$.]*", line):
+            for part in token.split("."):
+                if len(part) > 2 and part not in KEYWORDS:
+                    refs.add((part, number, "resource"))
+    return refs
+
+
+def parse_file(args):
+    root, relative = args
+    path = Path(root) / relative
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return relative, None, [], []
+    sha = hashlib.sha256(data).hexdigest()
+    text = data.decode("utf-8", errors="replace")
+    if path.suffix in SOURCE_SUFFIXES:
+        decls, refs = parse_source(path, text)
+    elif len(data) <= MAX_RESOURCE_BYTES:
+        decls, refs = [], parse_resource(text)
+    else:
+        decls, refs = [], set()
+    return relative, sha, decls, sorted(refs)
+
+
+# ---------------------------------------------------------------------------
+# Index storage
+# ---------------------------------------------------------------------------
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE files (path TEXT PRIMARY KEY, sha TEXT);
+CREATE TABLE decls (
+    name TEXT, kind TEXT, file TEXT, line INTEGER, parent TEXT, fqn TEXT,
+    annotations TEXT, entry_point INTEGER, endpoint TEXT
+);
+CREATE TABLE refs (name TEXT, file TEXT, line INTEGER, kind TEXT);
+CREATE INDEX decls_name ON decls (name);
+CREATE INDEX decls_file ON decls (file);
+CREATE INDEX refs_name ON refs (name, file);
+CREATE INDEX refs_file ON refs (file);
+"""
+
+
+def indexable(relative):
+    path = Path(relative)
+    if any(part in SKIP_DIRS for part in path.parts[:-1]):
+        return False
+    if path.suffix in SOURCE_SUFFIXES:
+        return True
+    if path.suffix in RESOURCE_SUFFIXES:
+        # Only resources the app or tests load, not build tooling config
+        return "resources" in path.parts or path.name.endswith((".factories", ".imports"))
+    return False
+
+
+def walk(root):
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for filename in sorted(filenames):
+            relative = Path(directory, filename).relative_to(root).as_posix()
+            if indexable(relative):
+                yield relative
+
+
+def git(root, *args):
+    result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def git_paths(root, *args):
+    """NUL-separated path output of a git command run in ``root``, or None on failure.
+
+    Callers pass ``--relative`` (diff) or rely on ls-files' cwd-relative output,
+    so paths match the index even when ``root`` is below the work tree top.
+    """
+    output = git(root, *args)
+    return None if output is None else [path for path in output.split("\0") if path]
+
+
+def changed_since(root, commit):
+    return git_paths(root, "diff", "--name-only", "-z", "--no-renames", "--relative", commit)
+
+
+def git_state(root):
+    """Return (HEAD commit or None, files under root differing from HEAD or untracked)."""
+    head = git(root, "rev-parse", "HEAD")
+    if head is None:
+        return None, []
+    dirty = changed_since(root, "HEAD") or []
+    dirty += git_paths(root, "ls-files", "-z", "--others", "--exclude-standard") or []
+    return head.strip(), sorted(set(dirty))
+
+
+def store(db, results):
+    for relative, sha, decls, refs in results:
+        db.execute("DELETE FROM files WHERE path = ?", (relative,))
+        db.execute("DELETE FROM decls WHERE file = ?", (relative,))
+        db.execute("DELETE FROM refs WHERE file = ?", (relative,))
+        if sha is None:
+            continue
+        db.execute("INSERT INTO files VALUES (?, ?)", (relative, sha))
+        db.executemany(
+            "INSERT INTO decls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (d["name"], d["kind"], relative, d["line"], d["parent"], d["fqn"],
+                 ",".join(d["annotations"]), int(d["entry_point"]), d["endpoint"])
+                for d in decls
+            ],
+        )
+        db.executemany("INSERT INTO refs VALUES (?, ?, ?, ?)", [(n, relative, l, k) for n, l, k in refs])
+
+
+def parse_all(root, files, jobs):
+    work = [(str(root), relative) for relative in files]
+    if jobs == 1 or len(work) < 50:
+        return [parse_file(item) for item in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(parse_file, work, chunksize=max(1, len(work) // (jobs * 8))))
+
+
+def write_meta(db, root):
+    commit, dirty = git_state(root)
+    db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+        ("version", str(INDEX_VERSION)),
+        ("commit", commit or ""),
+        ("dirty", json.dumps(dirty)),
+    ])
+
+
+def open_index(path):
+    if not path.is_file():
+        error(f"No index at {path}; run: ref_index.py build")
+    db = sqlite3.connect(path)
+    version = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if not version or int(version[0]) != INDEX_VERSION:
+        error(f"Index at {path} was built by another version; run: ref_index.py build")
+    return db
+
+
+def command_build(args):
+    root = args.root.resolve()
+    index = root / args.index if not args.index.is_absolute() else args.index
+    index.parent.mkdir(parents=True, exist_ok=True)
+    tmp = index.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+
+    files = list(walk(root))
+    db = sqlite3.connect(tmp)
+    db.executescript(SCHEMA)
+    with db:
+        store(db, parse_all(root, files, args.jobs))
+        write_meta(db, root)
+    db.close()
+    os.replace(tmp, index)
+
+    print(f"{GREEN}Indexed{RESET} {len(files)} files -> {index}")
+    if git(root, "rev-parse", "HEAD") is not None and git(root, "check-ignore", "-q", str(index)) is None:
+        print(f"{YELLOW}[WARN]{RESET} {index.relative_to(root)} is not gitignored")
+
+
+def command_update(args):
+    root = args.root.resolve()
+    index = root / args.index if not args.index.is_absolute() else args.index
+    db = open_index(index)
+    meta = dict(db.execute("SELECT key, value FROM meta"))
+    if not meta.get("commit"):
+        error("Index was built outside a git work tree; run: ref_index.py build")
+
+    changed = changed_since(root, meta["commit"])
+    if changed is None:
+        error(f"Indexed commit {meta['commit'][:12]} is unknown to git (rebased?); run: ref_index.py build")
+    _, dirty = git_state(root)
+    candidates = set(changed) | set(json.loads(meta.get("dirty", "[]"))) | set(dirty)
+    candidates = sorted(c for c in candidates if indexable(c))
+
+    known = dict(db.execute("SELECT path, sha FROM files"))
+    stale = []
+    for relative in candidates:
+        path = root / relative
+        if not path.is_file():
+            if relative in known:
+                stale.append(relative)
+        elif known.get(relative) != hashlib.sha256(path.read_bytes()).hexdigest():
+            stale.append(relative)
+
+    with db:
+        store(db, parse_all(root, stale, args.jobs))
+        write_meta(db, root)
+    db.close()
+    print(f"{GREEN}Updated{RESET} {len(stale)} of {len(candidates)} changed files -> {index}")
+
+
+def reference_rows(db, decl_name, exclude_tests):
+    sql = "SELECT file, line, kind FROM refs WHERE name = ?"
+    if exclude_tests:
+        sql += " AND file NOT LIKE '%/src/test/%' AND file NOT LIKE 'src/test/%'"
+    return db.execute(sql + " ORDER BY file, line", (decl_name,)).fetchall()
+
+
+def command_query(args):
+    root = args.root.resolve()
+    index = root / args.index if not args.index.is_absolute() else args.index
+    db = open_index(index)
+
+    if args.unreferenced:
+        result = unreferenced(db, args.kind, args.exclude_tests)
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            for d in result:
+                print(f"{d['kind']:<7} {d['fqn']}  {d['file']}:{d['line']}")
+            print(f"\n{len(result)} unreferenced declaration(s) (entry points excluded)")
+        return
+
+    if not args.name:
+        error("query needs a NAME or --unreferenced")
+    simple = args.name.rsplit(".", 1)[-1]
+    decls = [
+        dict(zip(("name", "kind", "file", "line", "parent", "fqn", "annotations", "entry_point", "endpoint"), row))
+        for row in db.execute("SELECT * FROM decls WHERE name = ? ORDER BY file, line", (simple,))
+    ]
+    if "." in args.name:
+        decls = [d for d in decls if d["fqn"] == args.name or d["fqn"].endswith("." + args.name)]
+    declared_at = {(d["file"], d["line"]) for d in decls}
+    refs = [
+        {"file": f, "line": l, "kind": k}
+        for f, l, k in reference_rows(db, simple, args.exclude_tests)
+        if (f, l) not in declared_at
+    ]
+
+    if args.json:
+        print(json.dumps({"name": args.name, "declarations": decls, "references": refs}, indent=2))
+        return
+
+    for d in decls:
+        tags = []
+        if d["entry_point"]:
+            tags.append("entry point")
+        if d["endpoint"]:
+            tags.append(d["endpoint"])
+        if d["annotations"]:
+            tags.append(" ".join("@" + a for a in d["annotations"].split(",")))
+        suffix = f"  [{'; '.join(tags)}]" if tags else ""
+        print(f"{d['kind']:<7} {d['fqn']}  {d['file']}:{d['line']}{suffix}")
+    if not decls:
+        print(f"No declaration named {args.name}")
+    files = {r["file"] for r in refs}
+    print(f"\n{len(refs)} reference(s) in {len(files)} file(s):")
+    for r in refs:
+        print(f"  {r['file']}:{r['line']}  {r['kind']}")
+
+
+def unreferenced(db, kind, exclude_tests):
+    """Non-entry-point declarations with no reference besides their own declaration line.
+
+    Constructor declarations are never indexed as references, so a type used
+    only by name inside its own file (a nested helper, a same-file enum) still
+    counts as referenced.
+    """
+    test_filter = " AND r.file NOT LIKE '%/src/test/%' AND r.file NOT LIKE 'src/test/%'" if exclude_tests else ""
+    sql = f"""
+        SELECT d.kind, d.fqn, d.file, d.line FROM decls d
+        WHERE d.entry_point = 0
+          AND (? IS NULL OR d.kind = ?)
+          AND NOT EXISTS (
+              SELECT 1 FROM refs r WHERE r.name = d.name{test_filter}
+                AND NOT (r.file = d.file AND r.line = d.line)
+          )
+        ORDER BY d.file, d.line
+    """
+    if exclude_tests:
+        sql = sql.replace("WHERE d.entry_point = 0", "WHERE d.entry_point = 0 AND d.file NOT LIKE '%src/test/%'")
+    return [dict(zip(("kind", "fqn", "file", "line"), row)) for row in db.execute(sql, (kind, kind))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Declaration -> reference index for JVM dead-code audits.")
+    parser.add_argument("--root", type=Path, default=Path("."), help="project root (default: cwd)")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX, help=f"index path, relative to root (default: {DEFAULT_INDEX})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("build", "index the whole project"), ("update", "re-index files changed since the last build/update")):
+        sub = commands.add_parser(name, help=help_text)
+        sub.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="parser processes (default: CPU count)")
+
+    query = commands.add_parser("query", help="who references NAME, or list unreferenced declarations")
+    query.add_argument("name", nargs="?", help="simple or qualified name, e.g. OrderService or com.acme.OrderService")
+    query.add_argument("--unreferenced", action="store_true", help="list non-entry-point declarations with no references")
+    query.add_argument("--kind", choices=("class", "method"), help="restrict --unreferenced to one kind")
+    query.add_argument("--exclude-tests", action="store_true", help="ignore references from src/test")
+    query.add_argument("--json", action="store_true")
+
+    args = parser.parse_args(argv)
+    {"build": command_build, "update": command_update, "query": command_query}[args.command](args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
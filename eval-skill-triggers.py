@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""Trigger-regression suite for skill descriptions.
+
+Each ``skill-evals/<skill>.jsonl`` file lists queries that should trigger the
+skill and near-misses that should not:
+
+    {"query": "Review this class for Object Calisthenics violations", "should_trigger": true}
+
+For each query the runner shows the model the skill's listing (name plus
+description, read at runtime from ``claude/.claude/skills/<skill>/SKILL.md``,
+or from ``agents/<skill>.md`` for agent-backed entries). It offers a ``Skill``
+tool and records whether the model calls it. A query passes when its trigger
+rate over ``--runs`` lands on the expected side of 0.5.
+
+Results are cached in ``skill-evals/cache.jsonl``, keyed by
+sha256(description) + query + model. Only skills whose description changed,
+or queries that are new, get probed again. Infra errors (rate limits,
+overload, network) are retried, then reported in their own bucket. They are
+never counted as "did not trigger" and never cached.
+
+    ./eval-skill-triggers.py                      all skills, live API
+    ./eval-skill-triggers.py tpp-guide jira       selected skills
+    ./eval-skill-triggers.py --backend=stub       offline keyword stand-in for CI
+    ./eval-skill-triggers.py --jobs=2 --budget=50 cap concurrency and API calls
+
+Exit status: 0 all passed, 1 at least one real miss, 2 no misses but some
+queries were left unresolved by infra errors or the budget, 3 the run was
+aborted before any verdict: the API rejected a request outright (bad key,
+unknown --model), or an eval file is missing or malformed.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+EVALS_DIR = REPO_ROOT / "skill-evals"
+CACHE_FILE = EVALS_DIR / "cache.jsonl"
+CLAUDE_DIR = REPO_ROOT / "claude" / ".claude"
+
+DEFAULT_MODEL = "claude-haiku-4-5"
+API_URL = "https://api.anthropic.com/v1/messages"
+API_VERSION = "2023-06-01"
+TRIGGER_THRESHOLD = 0.5
+
+# HTTP statuses that say nothing about the skill: retry, then report as infra
+INFRA_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# Exit status for a run aborted by a rejected request or a bad eval file, so
+# CI can tell a broken setup from a trigger regression (1)
+EXIT_ABORTED = 3
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+RESET = "\033[0m"
+
+SYSTEM_PROMPT = """You are a coding assistant running in the user's terminal.
+
+Skills provide specialised instructions for particular tasks. When the user's \
+request matches an available skill, invoke it with the Skill tool before \
+doing anything else. Do not invoke a skill that does not match the request.
+
+<available_skills>
+<skill>
+<name>{name}</name>
+<description>{description}</description>
+</skill>
+</available_skills>"""
+
+SKILL_TOOL = {
+    "name": "Skill",
+    "description": "Execute a skill by name.",
+    "input_schema": {
+        "type": "object",
+        "properties": {"skill": {"type": "string", "description": "The skill name"}},
+        "required": ["skill"],
+    },
+}
+
+
+class InfraError(Exception):
+    """The probe failed for reasons unrelated to the skill description."""
+
+
+class BudgetExhausted(Exception):
+    pass
+
+
+class RequestRejected(Exception):
+    """The API refused the request itself (401, 400, 404, ...); every other probe would fail the same way."""
+
+
+@dataclass
+class Query:
+    skill: str
+    text: str
+    should_trigger: bool
+    runs: list = field(default_factory=list)  # one bool per clean run
+    cached: int = 0
+    infra_errors: int = 0
+    skipped: int = 0
+
+    @property
+    def rate(self):
+        return sum(self.runs) / len(self.runs) if self.runs else None
+
+    @property
+    def status(self):
+        if self.rate is not None:
+            return "pass" if (self.rate >= TRIGGER_THRESHOLD) == self.should_trigger else "fail"
+        return "infra" if self.infra_errors else "skipped"
+
+
+def read_listing(skill, claude_dir):
+    """Return the skill's listing text (description plus when_to_use) from its frontmatter."""
+    for path in (claude_dir / "skills" / skill / "SKILL.md", claude_dir / "agents" / f"{skill}.md"):
+        if path.is_file():
+            fields = parse_frontmatter(path.read_text(encoding="utf-8"))
+            if fields.get("description"):
+                return " ".join(filter(None, [fields["description"], fields.get("when_to_use")]))
+    return None
+
+
+def parse_frontmatter(text):
+    """Minimal YAML frontmatter reader: top-level scalar keys, folded/indented continuations."""
+    match = re.match(r"---\n(.*?)\n---", text, re.S)
+    if not match:
+        return {}
+    fields = {}
+    key = None
+    for line in match.group(1).splitlines():
+        top = re.match(r"([A-Za-z_][\w-]*):\s*(.*)$", line)
+        if top and not line[0].isspace():
+            key, value = top.group(1), top.group(2).strip()
+            fields[key] = "" if value in (">", "|", ">-", "|-") else value.strip("'\"")
+        elif key and line.strip():
+            fields[key] = f"{fields[key]} {line.strip()}".strip()
+    return fields
+
+
+def cache_key(description_sha, query, model):
+    return hashlib.sha256(f"{description_sha}\0{query}\0{model}".encode()).hexdigest()
+
+
+def load_cache():
+    cache = {}
+    if CACHE_FILE.is_file():
+        for line in CACHE_FILE.read_text(encoding="utf-8").splitlines():
+            if line.strip():
+                entry = json.loads(line)
+                cache.setdefault(entry["key"], []).append(entry["triggered"])
+    return cache
+
+
+def anthropic_probe(name, description, query, model):
+    body = json.dumps({
+        "model": model,
+        "max_tokens": 256,
+        "system": SYSTEM_PROMPT.format(name=name, description=description),
+        "tools": [SKILL_TOOL],
+        "messages": [{"role": "user", "content": query}],
+    }).encode()
+    request = urllib.request.Request(API_URL, data=body, method="POST", headers={
+        "content-type": "application/json",
+        "x-api-key": os.environ["ANTHROPIC_API_KEY"],
+        "anthropic-version": API_VERSION,
+    })
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            message = json.load(response)
+    except urllib.error.HTTPError as error:
+        if error.code in INFRA_STATUSES:
+            raise InfraError(f"HTTP {error.code}") from error
+        raise RequestRejected(f"HTTP {error.code} {error.read().decode(errors='replace')}") from error
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as error:
+        raise InfraError(str(error)) from error
+
+    return any(
+        block.get("type") == "tool_use"
+        and block.get("name") == "Skill"
+        and block.get("input", {}).get("skill") == name
+        for block in message.get("content", [])
+    )
+
+
+STOPWORDS = set("""
+a an and any are as at be before but by can do does for from get give has have help how i if in into is it
+its just me my need not of on or our please so than that the their them then there these this to up use
+used using want was we what when where which while who why will with without you your
+""".split())
+
+
+def words(text):
+    return {word for word in re.findall(r"[a-z][a-z0-9+#-]{2,}", text.lower()) if word not in STOPWORDS}
+
+
+def stub_probe(name, description, query, model):
+    """Offline stand-in: trigger when the query shares two or more content words with the listing.
+
+    Deterministic and free. It exercises the runner, eval files and exit codes
+    in CI. It says nothing about how a real model routes.
+    """
+    listing = words(f"{name.replace('-', ' ')} {description}")
+    return len(words(query) & listing) >= 2
+
+
+BACKENDS = {"anthropic": anthropic_probe, "stub": stub_probe}
+
+
+class Runner:
+    def __init__(self, probe, model, budget, retries, cache_results):
+        self.probe = probe
+        self.model = model
+        self.budget = budget
+        self.retries = retries
+        self.cache_results = cache_results
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def _spend(self):
+        with self.lock:
+            if self.calls >= self.budget:
+                raise BudgetExhausted()
+            self.calls += 1
+
+    def run_once(self, query, description, description_sha):
+        """One probe run with retries. Returns True/False, or raises InfraError/BudgetExhausted/RequestRejected."""
+        for attempt in range(self.retries + 1):
+            self._spend()
+            try:
+                triggered = self.probe(query.skill, description, query.text, self.model)
+                break
+            except InfraError:
+                if attempt == self.retries:
+                    raise
+                time.sleep(2 ** attempt)
+
+        if self.cache_results:
+            entry = {
+                "key": cache_key(description_sha, query.text, self.model),
+                "skill": query.skill,
+                "model": self.model,
+                "description_sha256": description_sha,
+                "query": query.text,
+                "triggered": triggered,
+            }
+            with self.lock, CACHE_FILE.open("a", encoding="utf-8") as cache:
+                cache.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return triggered
+
+
+def abort(message):
+    print(f"{RED}[ERROR]{RESET} {message}", file=sys.stderr)
+    sys.exit(EXIT_ABORTED)
+
+
+def load_queries(skill):
+    path = EVALS_DIR / f"{skill}.jsonl"
+    queries = []
+    for number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        if line.strip():
+            row = json.loads(line)
+            if not isinstance(row.get("query"), str) or not isinstance(row.get("should_trigger"), bool):
+                abort(f"{path}:{number}: expected {{\"query\": str, \"should_trigger\": bool}}")
+            queries.append(Query(skill, row["query"], row["should_trigger"]))
+    return queries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run skill trigger evals with caching.")
+    parser.add_argument("skills", nargs="*", help="skills to evaluate (default: every skill-evals/*.jsonl)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="anthropic")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--runs", type=int, default=3, help="probe runs per query (default 3)")
+    parser.add_argument("--jobs", type=int, default=4, help="concurrent probes (default 4)")
+    parser.add_argument("--budget", type=int, default=200, help="max API calls this invocation, retries included (default 200)")
+    parser.add_argument("--retries", type=int, default=2, help="retries per run on infra errors (default 2)")
+    parser.add_argument("--claude-dir", type=Path, default=CLAUDE_DIR, help="where skills/ and agents/ live")
+    parser.add_argument("--json", action="store_true", help="print per-query results as JSON")
+    args = parser.parse_args(argv)
+
+    for name in ("runs", "jobs", "budget"):
+        if getattr(args, name) < 1:
+            parser.error(f"--{name} must be at least 1")
+
+    skills = args.skills or sorted(path.stem for path in EVALS_DIR.glob("*.jsonl") if path != CACHE_FILE)
+    live = args.backend != "stub"
+    if live and not os.environ.get("ANTHROPIC_API_KEY"):
+        parser.error("ANTHROPIC_API_KEY is not set (use --backend=stub to run offline)")
+    cache = load_cache() if live else {}
+    # The stub is free, so only live backends are held to --budget
+    budget = args.budget if live else float("inf")
+    runner = Runner(BACKENDS[args.backend], args.model, budget, args.retries, cache_results=live)
+
+    queries = []
+    work = []  # (query, description, description_sha) per pending run
+    missing = []
+    for skill in skills:
+        if not (EVALS_DIR / f"{skill}.jsonl").is_file():
+            abort(f"No eval file: skill-evals/{skill}.jsonl")
+        description = read_listing(skill, args.claude_dir)
+        if description is None:
+            missing.append(skill)
+            continue
+        description_sha = hashlib.sha256(description.encode()).hexdigest()
+        for query in load_queries(skill):
+            cached = cache.get(cache_key(description_sha, query.text, args.model), [])[: args.runs]
+            query.runs.extend(cached)
+            query.cached = len(cached)
+            work.extend([(query, description, description_sha)] * (args.runs - len(cached)))
+            queries.append(query)
+
+    for skill in missing:
+        print(f"{YELLOW}[WARN]{RESET} No description found for {skill} under {args.claude_dir}; skipped", file=sys.stderr)
+
+    rejected = threading.Event()
+
+    def probe(item):
+        if rejected.is_set():
+            return
+        query, description, description_sha = item
+        try:
+            triggered = runner.run_once(query, description, description_sha)
+        except RequestRejected:
+            rejected.set()
+            raise
+        except InfraError:
+            with runner.lock:
+                query.infra_errors += 1
+        except BudgetExhausted:
+            with runner.lock:
+                query.skipped += 1
+        else:
+            with runner.lock:
+                query.runs.append(triggered)
+
+    pool = ThreadPoolExecutor(max_workers=args.jobs)
+    futures = [pool.submit(probe, item) for item in work]
+    try:
+        for future in as_completed(futures):
+            future.result()
+    except RequestRejected as error:
+        # Don't send the queued probes: they would all be rejected too
+        pool.shutdown(cancel_futures=True)
+        abort(f"API request failed: {error}")
+    pool.shutdown()
+
+    if args.json:
+        print(json.dumps([
+            {
+                "skill": q.skill,
+                "query": q.text,
+                "should_trigger": q.should_trigger,
+                "status": q.status,
+                "trigger_rate": q.rate,
+                "clean_runs": len(q.runs),
+                "cached_runs": q.cached,
+                "infra_errors": q.infra_errors,
+                "skipped_runs": q.skipped,
+            }
+            for q in queries
+        ], indent=2, ensure_ascii=False))
+    else:
+        report(queries, runner, args)
+
+    statuses = {q.status for q in queries}
+    if "fail" in statuses:
+        return 1
+    if statuses & {"infra", "skipped"} or missing:
+        return 2
+    return 0
+
+
+def report(queries, runner, args):
+    by_skill = {}
+    for query in queries:
+        by_skill.setdefault(query.skill, []).append(query)
+
+    print(f"{'skill':<30} {'pass':>6} {'fail':>5} {'infra':>6} {'budget':>7} {'cached':>7}")
+    for skill, rows in by_skill.items():
+        count = {status: sum(q.status == status for q in rows) for status in ("pass", "fail", "infra", "skipped")}
+        cached = sum(q.cached for q in rows)
+        total_runs = len(rows) * args.runs
+        colour = RED if count["fail"] else YELLOW if count["infra"] or count["skipped"] else GREEN
+        print(
+            f"{colour}{skill:<30}{RESET} {count['pass']:>3}/{len(rows):<2} {count['fail']:>5} "
+            f"{count['infra']:>6} {count['skipped']:>7} {cached:>3}/{total_runs}"
+        )
+
+    failures = [q for q in queries if q.status == "fail"]
+    if failures:
+        print(f"\n{RED}Misses{RESET} (expected side of {TRIGGER_THRESHOLD} trigger rate):")
+        for q in failures:
+            expected = "trigger" if q.should_trigger else "stay quiet"
+            print(f"  {q.skill}: should {expected}, rate {q.rate:.2f}: {q.text}")
+
+    unresolved = [q for q in queries if q.status in ("infra", "skipped")]
+    if unresolved:
+        print(f"\n{YELLOW}Unresolved{RESET} (infra errors or budget; not counted as misses, re-run to retry):")
+        for q in unresolved:
+            print(f"  {q.skill} [{q.status}]: {q.text}")
+
+    limit = f", budget {args.budget}" if args.backend != "stub" else ""
+    print(f"\n{runner.calls} {args.backend} call(s) made{limit}.")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
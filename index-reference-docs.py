@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Split large skill reference docs into per-section files plus an index.
+
+For each ``<name>.md`` this writes ``<name>.sections/``, which holds:
+
+- ``INDEX.md``: one row per section with its ID, heading, source line range,
+  estimated token count and file. Agents read this first.
+- ``<section-id>.md``: the section's lines copied verbatim from the source.
+
+Agents then Read only the sections they need instead of the whole document.
+The output is generated, so never edit it by hand. After changing a source
+doc, re-run this script.
+
+    ./index-reference-docs.py                   index DEFAULT_DOCS
+    ./index-reference-docs.py path/to/doc.md    index specific docs
+    ./index-reference-docs.py --level=3 ...     split at ### as well as ##
+    ./index-reference-docs.py --check           exit 1 if any index is stale
+
+Each INDEX.md records the level it was split at. Without --level, a doc is
+re-split (or checked) at its recorded level, or at level 2 if it has none.
+"""
+
+import argparse
+import math
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+SKILLS_DIR = REPO_ROOT / "claude" / ".claude" / "skills"
+
+DEFAULT_DOCS = [
+    "test-design-reviewer/signal-detection-patterns.md",
+    "cognitive-load-analyzer/cli-dimensions-and-formulas.md",
+    "cognitive-load-analyzer/cli-tool-commands.md",
+    "dead-code-audit/references/detectors.md",
+    "dead-code-audit/references/verify-candidate.md",
+    "domain-driven-design/ddd-expert-knowledge-base.md",
+]
+
+# Rough chars-per-token ratio for English prose and code; good enough to
+# compare sections, not to bill by.
+CHARS_PER_TOKEN = 4
+
+DEFAULT_LEVEL = 2
+
+HEADING = re.compile(r"^(#{1,6})\s+(.+?)(?:\s+#+)?\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+RESET = "\033[0m"
+
+
+@dataclass
+class Section:
+    id: str
+    title: str
+    start: int  # 1-based, inclusive
+    end: int  # 1-based, inclusive
+    lines: list
+
+    @property
+    def tokens(self):
+        return math.ceil(sum(len(line) for line in self.lines) / CHARS_PER_TOKEN)
+
+    @property
+    def filename(self):
+        return f"{self.id}.md"
+
+
+def slugify(text):
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug or "section"
+
+
+def split_sections(lines, level):
+    """Split at headings of depth <= level, ignoring '#' lines inside code fences.
+
+    A section's ID is the slug path of its heading and any enclosing split
+    headings below the document title, e.g. ``java--assertions``. Anything
+    before the first split heading (frontmatter, title, intro) is the
+    ``preamble`` section.
+    """
+    sections = []
+    stack = []  # (depth, slug) of enclosing split headings
+    seen = {}
+    current = Section("preamble", "(preamble)", 1, 0, [])
+    in_fence = False
+
+    for number, line in enumerate(lines, start=1):
+        if FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line)
+        depth = len(match.group(1)) if match else 0
+
+        if match and depth <= level and not (depth == 1 and level > 1):
+            if current.lines:
+                sections.append(current)
+            title = match.group(2)
+            stack = [(d, s) for d, s in stack if d < depth]
+            stack.append((depth, slugify(title)))
+            base = "--".join(slug for _, slug in stack)
+            seen[base] = seen.get(base, 0) + 1
+            section_id = base if seen[base] == 1 else f"{base}-{seen[base]}"
+            current = Section(section_id, title, number, number - 1, [])
+
+        current.lines.append(line)
+        current.end = number
+
+    if current.lines:
+        sections.append(current)
+    return sections
+
+
+def render(doc, level):
+    """Return {filename: content} for everything in the doc's sections directory."""
+    lines = doc.read_text(encoding="utf-8").splitlines(keepends=True)
+    sections = split_sections(lines, level)
+    source = f"../{doc.name}"
+    banner = "<!-- Generated by index-reference-docs.py from {} lines {}-{}; do not edit. -->\n"
+
+    files = {}
+    rows = []
+    for section in sections:
+        files[section.filename] = banner.format(source, section.start, section.end) + "".join(section.lines)
+        title = section.title.replace("|", "\\|")
+        rows.append(
+            f"| `{section.id}` | {title} | {section.start}-{section.end} "
+            f"| ~{section.tokens} | [{section.filename}]({section.filename}) |\n"
+        )
+
+    total = math.ceil(sum(len(line) for line in lines) / CHARS_PER_TOKEN)
+    files["INDEX.md"] = (
+        f"<!-- Generated by index-reference-docs.py from {source} (--level={level}); do not edit. -->\n"
+        f"# {doc.name} sections\n\n"
+        f"Whole document: {len(lines)} lines, ~{total} tokens. "
+        f"Read only the sections you need.\n\n"
+        "| ID | Heading | Lines | Tokens | File |\n"
+        "|----|---------|-------|--------|------|\n"
+        + "".join(rows)
+    )
+    return files
+
+
+def sections_dir(doc):
+    return doc.with_name(f"{doc.stem}.sections")
+
+
+def recorded_level(doc):
+    index = sections_dir(doc) / "INDEX.md"
+    if index.is_file():
+        match = re.search(r"\(--level=(\d)\)", index.read_text(encoding="utf-8").split("\n", 1)[0])
+        if match:
+            return int(match.group(1))
+    return DEFAULT_LEVEL
+
+
+def write(doc, files):
+    out = sections_dir(doc)
+    out.mkdir(exist_ok=True)
+    for stale in out.glob("*.md"):
+        if stale.name not in files:
+            stale.unlink()
+    for name, content in files.items():
+        path = out / name
+        if not path.exists() or path.read_text(encoding="utf-8") != content:
+            path.write_text(content, encoding="utf-8")
+
+
+def check(doc, files):
+    """Return a list of problems that make the doc's index stale."""
+    out = sections_dir(doc)
+    if not out.is_dir():
+        return [f"{out} does not exist"]
+
+    problems = []
+    on_disk = {path.name for path in out.glob("*.md")}
+    for name, content in files.items():
+        path = out / name
+        if name not in on_disk:
+            problems.append(f"missing {path}")
+        elif path.read_text(encoding="utf-8") != content:
+            problems.append(f"out of date {path}")
+    for name in sorted(on_disk - files.keys()):
+        problems.append(f"no longer generated {out / name}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split reference docs into indexed per-section files.")
+    parser.add_argument("docs", nargs="*", type=Path, help="markdown files (default: DEFAULT_DOCS under claude/.claude/skills)")
+    parser.add_argument(
+        "--level",
+        type=int,
+        choices=range(1, 7),
+        help=f"deepest heading level to split at (default: the doc's recorded level, else {DEFAULT_LEVEL})",
+    )
+    parser.add_argument("--check", action="store_true", help="exit 1 if any index is missing or stale")
+    args = parser.parse_args(argv)
+
+    docs = args.docs or [SKILLS_DIR / doc for doc in DEFAULT_DOCS]
+    missing = [doc for doc in docs if not doc.is_file()]
+    if missing:
+        for doc in missing:
+            print(f"{RED}[ERROR]{RESET} No such document: {doc}", file=sys.stderr)
+        return 1
+
+    stale = False
+    for doc in docs:
+        files = render(doc, args.level or recorded_level(doc))
+        if args.check:
+            problems = check(doc, files)
+            for problem in problems:
+                print(f"{RED}[ERROR]{RESET} {problem}", file=sys.stderr)
+            stale = stale or bool(problems)
+        else:
+            write(doc, files)
+            print(f"{GREEN}Indexed{RESET} {doc} ({len(files) - 1} sections)")
+
+    if stale:
+        print(f"{RED}[ERROR]{RESET} Section indexes are stale; run ./index-reference-docs.py", file=sys.stderr)
+        return 1
+    if args.check:
+        print(f"{GREEN}Up to date{RESET} {len(docs)} section index(es)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
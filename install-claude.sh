@@ -1,7 +1,10 @@
 #!/bin/bash
 set -e
 
-REPO_URL="https://raw.githubusercontent.com/benjaminrae/.dotfiles/main/claude/.claude"
+REPO_ROOT_URL="https://raw.githubusercontent.com/benjaminrae/.dotfiles/main"
+REPO_URL="${REPO_ROOT_URL}/claude/.claude"
+ARCHIVE_URL="https://codeload.github.com/benjaminrae/.dotfiles/tar.gz/refs/heads/main"
+MANIFEST="claude-manifest.txt"
 CLAUDE_DIR="$HOME/.claude"
 
 # Color definitions
@@ -29,6 +32,9 @@ INSTALL_SKILLS=false
 INSTALL_AGENTS=false
 INSTALL_SETTINGS=false
 EXPLICIT_FLAG=false
+SOURCE_DIR=""
+ARCHIVE=""
+JOBS=8
 
 for arg in "$@"; do
     case "$arg" in
@@ -44,6 +50,18 @@ for arg in "$@"; do
             INSTALL_AGENTS=true
             EXPLICIT_FLAG=true
             ;;
+        --source=*)
+            SOURCE_DIR="${arg#--source=}"
+            ;;
+        --archive)
+            ARCHIVE="$ARCHIVE_URL"
+            ;;
+        --archive=*)
+            ARCHIVE="${arg#--archive=}"
+            ;;
+        --jobs=*)
+            JOBS="${arg#--jobs=}"
+            ;;
         *)
             error "Unknown flag: $arg"
             exit 1
@@ -51,6 +69,18 @@ for arg in "$@"; do
     esac
 done
 
+if [ -n "$SOURCE_DIR" ] && [ -n "$ARCHIVE" ]; then
+    error "--source and --archive cannot be combined"
+    exit 1
+fi
+
+case "$JOBS" in
+    ''|*[!0-9]*|0)
+        error "--jobs expects a positive integer, got: $JOBS"
+        exit 1
+        ;;
+esac
+
 # Default: install everything when no specific flag is given
 if [ "$EXPLICIT_FLAG" = false ]; then
     INSTALL_CLAUDE_MD=true
@@ -59,39 +89,56 @@ if [ "$EXPLICIT_FLAG" = false ]; then
     INSTALL_SETTINGS=true
 fi
 
-# Always install settings.json unless a specific --*-only flag was used
-if [ "$EXPLICIT_FLAG" = false ]; then
-    INSTALL_SETTINGS=true
-fi
+# One timestamp per run so every backup from this install sorts together
+TIMESTAMP="$(date +%Y%m%d_%H%M%S)"
+
+STAGING_DIR="$(mktemp -d)"
+trap 'rm -rf "$STAGING_DIR"' EXIT
 
-# Backup a file or directory with a timestamp before overwriting
+# Backup a file with the run timestamp before overwriting
 backup_file() {
     local target="$1"
-    local timestamp
-    timestamp="$(date +%Y%m%d_%H%M%S)"
 
     if [ -f "$target" ]; then
-        local backup="${target}.bak.${timestamp}"
+        local backup="${target}.bak.${TIMESTAMP}"
         warn "Backing up existing file: $target -> $backup"
         cp "$target" "$backup"
-    elif [ -d "$target" ]; then
-        local backup="${target}.bak.${timestamp}"
-        warn "Backing up existing directory: $target -> $backup"
-        cp -r "$target" "$backup"
     fi
 }
 
-# Download a single file from the remote repo into CLAUDE_DIR
-download_file() {
-    local relative_path="$1"
-    local dest="${CLAUDE_DIR}/${relative_path}"
-    local dest_dir
-    dest_dir="$(dirname "$dest")"
-    local url="${REPO_URL}/${relative_path}"
+file_sha256() {
+    if command -v sha256sum >/dev/null 2>&1; then
+        sha256sum "$1" | cut -d' ' -f1
+    else
+        shasum -a 256 "$1" | cut -d' ' -f1
+    fi
+}
 
-    mkdir -p "$dest_dir"
-    backup_file "$dest"
+# Map a manifest path to the flag group that installs it
+path_group() {
+    case "$1" in
+        CLAUDE.md) echo "claude" ;;
+        skills/*) echo "skills" ;;
+        agents/*) echo "agents" ;;
+        *) echo "settings" ;;
+    esac
+}
+
+group_selected() {
+    case "$1" in
+        claude) [ "$INSTALL_CLAUDE_MD" = true ] ;;
+        skills) [ "$INSTALL_SKILLS" = true ] ;;
+        agents) [ "$INSTALL_AGENTS" = true ] ;;
+        settings) [ "$INSTALL_SETTINGS" = true ] ;;
+    esac
+}
 
+# Fetch a single URL; used for the manifest and when curl is unavailable
+fetch() {
+    local url="$1"
+    local dest="$2"
+
+    mkdir -p "$(dirname "$dest")"
     if command -v curl >/dev/null 2>&1; then
         curl -fsSL "$url" -o "$dest"
     elif command -v wget >/dev/null 2>&1; then
@@ -100,146 +147,151 @@ download_file() {
         error "Neither curl nor wget is available. Cannot download files."
         exit 1
     fi
+}
+
+# Download every path listed in $1 into STAGING_DIR. curl gets a single
+# config file so one process handles the batch, reusing connections and
+# running up to JOBS transfers at once where --parallel is supported.
+download_all() {
+    local list="$1"
+    local path
+
+    [ -s "$list" ] || return 0
+
+    if command -v curl >/dev/null 2>&1; then
+        local config="${STAGING_DIR}/.curl-config"
+        : > "$config"
+        while IFS= read -r path; do
+            printf 'url = "%s/%s"\noutput = "%s/%s"\n' \
+                "$REPO_URL" "$path" "$STAGING_DIR" "$path" >> "$config"
+        done < "$list"
+
+        # --no-progress-meter (7.67+) also implies --parallel (7.66+); -s alone
+        # doesn't silence the parallel progress meter
+        if curl --help all 2>/dev/null | grep -q -- '--no-progress-meter'; then
+            curl -fsSL --no-progress-meter --create-dirs --parallel --parallel-max "$JOBS" -K "$config"
+        else
+            curl -fsSL --create-dirs -K "$config"
+        fi
+    else
+        while IFS= read -r path; do
+            fetch "${REPO_URL}/${path}" "${STAGING_DIR}/${path}"
+        done < "$list"
+    fi
+}
+
+# Copy src over CLAUDE_DIR/relative_path, backing up only when the content changes
+install_file() {
+    local src="$1"
+    local relative_path="$2"
+    local dest="${CLAUDE_DIR}/${relative_path}"
+
+    if [ -f "$dest" ] && cmp -s "$src" "$dest"; then
+        UNCHANGED+=("$relative_path")
+        return
+    fi
+
+    mkdir -p "$(dirname "$dest")"
+    backup_file "$dest"
+    cp "$src" "$dest"
+    case "$dest" in
+        *.sh) chmod +x "$dest" ;;
+    esac
 
     info "Installed: $dest"
+    INSTALLED+=("$relative_path")
 }
 
+# Resolve where files come from: a local checkout, an extracted archive, or the network
+if [ -n "$ARCHIVE" ]; then
+    mkdir -p "${STAGING_DIR}/archive"
+    case "$ARCHIVE" in
+        http://*|https://*)
+            info "Downloading archive: $ARCHIVE"
+            fetch "$ARCHIVE" "${STAGING_DIR}/archive.tar.gz"
+            tar -xzf "${STAGING_DIR}/archive.tar.gz" -C "${STAGING_DIR}/archive" --strip-components=1
+            ;;
+        *)
+            tar -xzf "$ARCHIVE" -C "${STAGING_DIR}/archive" --strip-components=1
+            ;;
+    esac
+    SOURCE_DIR="${STAGING_DIR}/archive"
+fi
+
+if [ -n "$SOURCE_DIR" ]; then
+    if [ ! -f "${SOURCE_DIR}/${MANIFEST}" ]; then
+        error "No ${MANIFEST} found in source: $SOURCE_DIR"
+        exit 1
+    fi
+    MANIFEST_FILE="${SOURCE_DIR}/${MANIFEST}"
+else
+    MANIFEST_FILE="${STAGING_DIR}/${MANIFEST}"
+    fetch "${REPO_ROOT_URL}/${MANIFEST}" "$MANIFEST_FILE"
+fi
+
 # Track installed items for the summary
 INSTALLED=()
+UNCHANGED=()
 
 # Main installation logic
 mkdir -p "$CLAUDE_DIR"
 
-if [ "$INSTALL_SETTINGS" = true ]; then
-    download_file "settings.json"
-    download_file "hooks/pre-tool-use-bash.sh"
-    chmod +x "${CLAUDE_DIR}/hooks/pre-tool-use-bash.sh"
-    download_file "templates/java-spring-boot-CLAUDE.md"
-    INSTALLED+=("settings.json" "hooks/pre-tool-use-bash.sh" "templates/java-spring-boot-CLAUDE.md")
-fi
+# Select manifest entries for the requested groups, skipping files whose
+# local checksum already matches without touching the network
+SELECTED="${STAGING_DIR}/.selected"
+PENDING="${STAGING_DIR}/.pending"
+: > "$SELECTED"
+: > "$PENDING"
 
-if [ "$INSTALL_CLAUDE_MD" = true ]; then
-    download_file "CLAUDE.md"
-    INSTALLED+=("CLAUDE.md")
-fi
+while read -r checksum path; do
+    case "$checksum" in
+        ''|'#'*) continue ;;
+    esac
+    group_selected "$(path_group "$path")" || continue
 
-if [ "$INSTALL_SKILLS" = true ]; then
-    download_file "skills/jira/SKILL.md"
-    download_file "skills/jira/bug-template.md"
-    download_file "skills/jira/mcp-reference.md"
-    download_file "skills/branch-review/SKILL.md"
-    download_file "skills/branch-review/report-template.md"
-    download_file "skills/branch-review/agents/automated-checks.md"
-    download_file "skills/branch-review/agents/architecture-review.md"
-    download_file "skills/branch-review/agents/test-quality-review.md"
-    download_file "skills/branch-review/agents/standards-review.md"
-    download_file "skills/branch-review/agents/postgresql-review.md"
-    download_file "skills/branch-review/agents/report-compiler.md"
-    download_file "skills/branch-review/agents/finding-validator.md"
-    download_file "skills/java-conventions/SKILL.md"
-    download_file "skills/tdd-kata-coach/SKILL.md"
-    download_file "skills/outside-in-tdd/SKILL.md"
-    download_file "skills/tpp-guide/SKILL.md"
-    download_file "skills/tpp-guide/transformations-reference.md"
-    download_file "skills/characterization-testing/SKILL.md"
-    download_file "skills/object-calisthenics-review/SKILL.md"
-    download_file "skills/refactoring-guide/SKILL.md"
-    download_file "skills/postgresql-guidelines/SKILL.md"
-    download_file "skills/postgresql-guidelines/conventions-reference.md"
-    # Agent-associated skills
-    download_file "skills/domain-driven-design/ddd-expert-knowledge-base.md"
-    download_file "skills/cognitive-load-analyzer/cli-dimensions-and-formulas.md"
-    download_file "skills/cognitive-load-analyzer/cli-tool-commands.md"
-    download_file "skills/cognitive-load-analyzer/lib/__init__.py"
-    download_file "skills/cognitive-load-analyzer/lib/cli_calculator.py"
-    download_file "skills/cognitive-load-analyzer/lib/core.py"
-    download_file "skills/cognitive-load-analyzer/lib/dimensions.py"
-    download_file "skills/cognitive-load-analyzer/lib/aggregation.py"
-    download_file "skills/cognitive-load-analyzer/lib/sampling.py"
-    download_file "skills/test-design-reviewer/farley-properties-and-scoring.md"
-    download_file "skills/test-design-reviewer/signal-detection-patterns.md"
-    download_file "skills/system-walkthrough/analysis-pipeline.md"
-    download_file "skills/system-walkthrough/narrative-structure.md"
-    download_file "skills/system-walkthrough/slide-architecture.md"
-    download_file "skills/system-walkthrough/code-validation.md"
-    download_file "skills/system-walkthrough/comprehension-models.md"
-    INSTALLED+=(
-        "skills/jira/SKILL.md"
-        "skills/jira/bug-template.md"
-        "skills/jira/mcp-reference.md"
-        "skills/branch-review/SKILL.md"
-        "skills/branch-review/report-template.md"
-        "skills/branch-review/agents/automated-checks.md"
-        "skills/branch-review/agents/architecture-review.md"
-        "skills/branch-review/agents/test-quality-review.md"
-        "skills/branch-review/agents/standards-review.md"
-        "skills/branch-review/agents/postgresql-review.md"
-        "skills/branch-review/agents/report-compiler.md"
-        "skills/branch-review/agents/finding-validator.md"
-        "skills/java-conventions/SKILL.md"
-        "skills/tdd-kata-coach/SKILL.md"
-        "skills/outside-in-tdd/SKILL.md"
-        "skills/tpp-guide/SKILL.md"
-        "skills/tpp-guide/transformations-reference.md"
-        "skills/characterization-testing/SKILL.md"
-        "skills/object-calisthenics-review/SKILL.md"
-        "skills/refactoring-guide/SKILL.md"
-        "skills/postgresql-guidelines/SKILL.md"
-        "skills/postgresql-guidelines/conventions-reference.md"
-        "skills/domain-driven-design/ddd-expert-knowledge-base.md"
-        "skills/cognitive-load-analyzer/cli-dimensions-and-formulas.md"
-        "skills/cognitive-load-analyzer/cli-tool-commands.md"
-        "skills/cognitive-load-analyzer/lib/__init__.py"
-        "skills/cognitive-load-analyzer/lib/cli_calculator.py"
-        "skills/cognitive-load-analyzer/lib/core.py"
-        "skills/cognitive-load-analyzer/lib/dimensions.py"
-        "skills/cognitive-load-analyzer/lib/aggregation.py"
-        "skills/cognitive-load-analyzer/lib/sampling.py"
-        "skills/test-design-reviewer/farley-properties-and-scoring.md"
-        "skills/test-design-reviewer/signal-detection-patterns.md"
-        "skills/system-walkthrough/analysis-pipeline.md"
-        "skills/system-walkthrough/narrative-structure.md"
-        "skills/system-walkthrough/slide-architecture.md"
-        "skills/system-walkthrough/code-validation.md"
-        "skills/system-walkthrough/comprehension-models.md"
-    )
-fi
+    printf '%s %s\n' "$checksum" "$path" >> "$SELECTED"
+    dest="${CLAUDE_DIR}/${path}"
+    if [ "$checksum" != "-" ] && [ -f "$dest" ] && [ "$(file_sha256 "$dest")" = "$checksum" ]; then
+        UNCHANGED+=("$path")
+    else
+        printf '%s\n' "$path" >> "$PENDING"
+    fi
+done < "$MANIFEST_FILE"
 
-if [ "$INSTALL_AGENTS" = true ]; then
-    download_file "agents/code-reviewer.md"
-    download_file "agents/typescript-expert.md"
-    download_file "agents/debugger-specialist.md"
-    download_file "agents/atdd-developer.md"
-    download_file "agents/problem-analyst.md"
-    download_file "agents/user-story-writer.md"
-    download_file "agents/domain-driven-design.md"
-    download_file "agents/clean-coder.md"
-    download_file "agents/refactoring-expert.md"
-    download_file "agents/code-smell-detector.md"
-    download_file "agents/legacy-code-expert.md"
-    download_file "agents/cognitive-load-analyzer.md"
-    download_file "agents/test-design-reviewer.md"
-    download_file "agents/system-walkthrough.md"
-    INSTALLED+=(
-        "agents/code-reviewer.md"
-        "agents/typescript-expert.md"
-        "agents/debugger-specialist.md"
-        "agents/atdd-developer.md"
-        "agents/problem-analyst.md"
-        "agents/user-story-writer.md"
-        "agents/domain-driven-design.md"
-        "agents/clean-coder.md"
-        "agents/refactoring-expert.md"
-        "agents/code-smell-detector.md"
-        "agents/legacy-code-expert.md"
-        "agents/cognitive-load-analyzer.md"
-        "agents/test-design-reviewer.md"
-        "agents/system-walkthrough.md"
-    )
+if [ -n "$SOURCE_DIR" ]; then
+    FILES_DIR="${SOURCE_DIR}/claude/.claude"
+else
+    download_all "$PENDING"
+    FILES_DIR="$STAGING_DIR"
 fi
 
+# Verify every pending file before touching CLAUDE_DIR, so a stale manifest
+# or corrupt download can't leave a half-updated install behind
+VERIFIED="${STAGING_DIR}/.verified"
+: > "$VERIFIED"
+
+while read -r checksum path; do
+    grep -qxF "$path" "$PENDING" || continue
+
+    src="${FILES_DIR}/${path}"
+    if [ ! -f "$src" ]; then
+        error "Missing from source: $path"
+        exit 1
+    fi
+    if [ "$checksum" != "-" ] && [ "$(file_sha256 "$src")" != "$checksum" ]; then
+        error "Checksum mismatch for $path (manifest is stale or download is corrupt)"
+        exit 1
+    fi
+    printf '%s\n' "$path" >> "$VERIFIED"
+done < "$SELECTED"
+
+while IFS= read -r path; do
+    install_file "${FILES_DIR}/${path}" "$path"
+done < "$VERIFIED"
+
 # Summary
-printf "\n${GREEN}Installation complete.${RESET} The following files were installed to ${CLAUDE_DIR}:\n"
-for item in "${INSTALLED[@]}"; do
+printf "\n${GREEN}Installation complete.${RESET} %d file(s) installed to ${CLAUDE_DIR}, %d already up to date.\n" \
+    "${#INSTALLED[@]}" "${#UNCHANGED[@]}"
+for item in ${INSTALLED[@]+"${INSTALLED[@]}"}; do
     printf "  ${GREEN}+${RESET} %s\n" "$item"
-done
\ No newline at end of file
+done
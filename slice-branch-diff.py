@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Pre-compute branch-review's diff artifacts: one diff, a hunk index and per-agent slices.
+
+Run once per review, from inside the repository being reviewed:
+
+    ./slice-branch-diff.py --base=BRANCH                 diff BRANCH...HEAD into a temp dir
+    ./slice-branch-diff.py --base=BRANCH --head=REF      diff BRANCH...REF
+    ./slice-branch-diff.py --base=BRANCH --out=DIR       write into DIR
+
+The output directory holds:
+
+- ``diff.txt``: the full ``git diff BASE...HEAD``.
+- ``changed-files.txt``: one changed path per line.
+- ``INDEX.md``: one row per file with its status, +/- counts, slice and
+  line range in ``diff.txt``, plus which slice each agent reads.
+- ``index.json``: the same, plus every hunk's old/new ranges, byte offset and
+  length, and line range in ``diff.txt``.
+- ``slices/<slice>.diff`` and ``slices/<slice>.files.txt``: the file sections
+  of ``diff.txt`` for each slice (``sql``, ``tests``, ``production``).
+
+Agents read ``INDEX.md`` and their own slice, or seek into ``diff.txt`` with
+the recorded ranges. None of them re-run ``git diff``. There is no default
+base branch: the review must ask which branch it targets.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# First matching slice wins, so a SQL fixture under src/test/ is a test
+SLICES = {
+    "tests": re.compile(
+        r"(^|/)(src/test|src/testFixtures|src/integrationTest|tests?|__tests__|spec)/"
+        r"|(Test|Tests|IT|Spec)\.(java|kt|groovy|scala)$"
+        r"|(^|/)test_[^/]*\.py$|_test\.(py|go)$|\.(test|spec)\.[jt]sx?$"
+    ),
+    "sql": re.compile(
+        r"\.sql$|(^|/)(migrations?|db/changelog|flyway|liquibase)/", re.IGNORECASE
+    ),
+    "production": re.compile(r""),
+}
+
+# Which slice each branch-review agent loads
+AGENT_SLICES = {
+    "architecture": "production",
+    "standards": "production",
+    "test-quality": "tests",
+    "postgresql-review": "sql",
+    "automated-checks": "changed-files.txt",
+}
+
+HUNK = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@ ?(.*)$")
+STATUSES = {"A": "added", "C": "copied", "D": "deleted", "M": "modified", "R": "renamed", "T": "type-changed"}
+
+RED = "\033[0;31m"
+GREEN = "\033[0;32m"
+YELLOW = "\033[1;33m"
+RESET = "\033[0m"
+
+
+class GitError(Exception):
+    pass
+
+
+def git(*args):
+    result = subprocess.run(["git", *args], capture_output=True)
+    if result.returncode != 0:
+        raise GitError(result.stderr.decode(errors="replace").strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def changed_files(range_):
+    """Return [(status, path, old_path)] in git's diff order."""
+    fields = git("diff", "--name-status", "-z", "--find-renames", range_).decode().split("\0")
+    files = []
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i]
+        if status[0] in "RC":
+            files.append((STATUSES[status[0]], fields[i + 2], fields[i + 1]))
+            i += 3
+        else:
+            files.append((STATUSES.get(status[0], "modified"), fields[i + 1], None))
+            i += 2
+    return files
+
+
+def file_sections(diff):
+    """Split a diff into per-file sections of (offset, lines), where lines are
+    (byte offset, bytes) pairs.
+    """
+    sections = []
+    offset = 0
+    for line in diff.splitlines(keepends=True):
+        if line.startswith(b"diff --git ") or not sections:
+            sections.append((offset, []))
+        sections[-1][1].append((offset, line))
+        offset += len(line)
+    return sections
+
+
+def slice_for(path):
+    return next(name for name, pattern in SLICES.items() if pattern.search(path))
+
+
+def index_file(status, path, old_path, section, first_line):
+    """Describe one file section; ``first_line`` is its 1-based line in diff.txt."""
+    start, lines = section
+    hunks = []
+    added = removed = 0
+    binary = False
+    for number, (offset, line) in enumerate(lines, start=first_line):
+        match = HUNK.match(line)
+        if match:
+            old_start, old_count, new_start, new_count, header = match.groups()
+            hunks.append({
+                "old_start": int(old_start),
+                "old_lines": int(old_count if old_count is not None else 1),
+                "new_start": int(new_start),
+                "new_lines": int(new_count if new_count is not None else 1),
+                "header": header.decode(errors="replace").strip(),
+                "offset": offset,
+                "length": 0,
+                "line": number,
+                "line_count": 0,
+            })
+        elif hunks:
+            if line.startswith(b"+"):
+                added += 1
+            elif line.startswith(b"-"):
+                removed += 1
+        elif line.startswith(b"Binary files ") or line.startswith(b"GIT binary patch"):
+            binary = True
+        if hunks:
+            hunks[-1]["length"] = offset + len(line) - hunks[-1]["offset"]
+            hunks[-1]["line_count"] = number - hunks[-1]["line"] + 1
+
+    end = lines[-1][0] + len(lines[-1][1])
+    return {
+        "path": path,
+        "old_path": old_path,
+        "status": status,
+        "binary": binary,
+        "slice": slice_for(path),
+        "added": added,
+        "removed": removed,
+        "offset": start,
+        "length": end - start,
+        "line": first_line,
+        "line_count": len(lines),
+        "hunks": hunks,
+    }
+
+
+def render_index(meta, files):
+    rows = []
+    for f in files:
+        path = f["path"].replace("|", "\\|")
+        status = f"{f['status']} (binary)" if f["binary"] else f["status"]
+        rows.append(
+            f"| `{path}` | {status} | +{f['added']} -{f['removed']} "
+            f"| {f['slice']} | {f['line']}-{f['line'] + f['line_count'] - 1} | {len(f['hunks'])} |\n"
+        )
+    agents = "".join(
+        f"| {agent} | `{target if target.endswith('.txt') else f'slices/{target}.diff'}` |\n"
+        for agent, target in AGENT_SLICES.items()
+    )
+    return (
+        "<!-- Generated by slice-branch-diff.py; do not edit. -->\n"
+        f"# Diff {meta['base']}...{meta['head']}\n\n"
+        f"Merge base `{meta['merge_base'][:12]}`, head `{meta['head_commit'][:12]}`: "
+        f"{len(files)} files, {sum(len(f['hunks']) for f in files)} hunks. "
+        "Read your slice, or `diff.txt` at a file's line range; do not re-run `git diff`. "
+        "Per-hunk byte offsets and line ranges are in `index.json`.\n\n"
+        "| Agent | Reads |\n|-------|-------|\n" + agents + "\n"
+        "| File | Status | Lines changed | Slice | diff.txt lines | Hunks |\n"
+        "|------|--------|---------------|-------|----------------|-------|\n" + "".join(rows)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write branch-review's diff, hunk index and per-agent slices.")
+    parser.add_argument("--base", required=True, help="branch the reviewed branch merges into (ask; no default)")
+    parser.add_argument("--head", default="HEAD", help="branch or commit under review (default: HEAD)")
+    parser.add_argument("--out", type=Path, help="output directory (default: a new temp dir)")
+    args = parser.parse_args(argv)
+
+    range_ = f"{args.base}...{args.head}"
+    try:
+        merge_base = git("merge-base", args.base, args.head).decode().strip()
+        head_commit = git("rev-parse", "--verify", f"{args.head}^{{commit}}").decode().strip()
+        diff = git("diff", "--no-color", "--no-ext-diff", "--find-renames", range_)
+        names = changed_files(range_)
+    except GitError as exc:
+        print(f"{RED}[ERROR]{RESET} {exc}", file=sys.stderr)
+        return 1
+
+    sections = file_sections(diff)
+    if len(sections) != len(names):
+        print(
+            f"{RED}[ERROR]{RESET} git diff has {len(sections)} file sections but "
+            f"--name-status lists {len(names)} files",
+            file=sys.stderr,
+        )
+        return 1
+
+    files = []
+    line = 1
+    for (status, path, old_path), section in zip(names, sections):
+        files.append(index_file(status, path, old_path, section, line))
+        line += len(section[1])
+
+    out = args.out or Path(tempfile.mkdtemp(prefix="branch-review-"))
+    (out / "slices").mkdir(parents=True, exist_ok=True)
+    (out / "diff.txt").write_bytes(diff)
+    (out / "changed-files.txt").write_text("".join(f"{f['path']}\n" for f in files), encoding="utf-8")
+    for name in SLICES:
+        members = [f for f in files if f["slice"] == name]
+        (out / "slices" / f"{name}.diff").write_bytes(b"".join(diff[f["offset"]:f["offset"] + f["length"]] for f in members))
+        (out / "slices" / f"{name}.files.txt").write_text("".join(f"{f['path']}\n" for f in members), encoding="utf-8")
+
+    meta = {"base": args.base, "head": args.head, "merge_base": merge_base, "head_commit": head_commit}
+    (out / "index.json").write_text(
+        json.dumps({**meta, "agents": AGENT_SLICES, "files": files}, indent=2) + "\n", encoding="utf-8"
+    )
+    (out / "INDEX.md").write_text(render_index(meta, files), encoding="utf-8")
+
+    if not files:
+        print(f"{YELLOW}[WARN]{RESET} No changes between {args.base} and {args.head}", file=sys.stderr)
+    counts = ", ".join(f"{name} {sum(f['slice'] == name for f in files)}" for name in SLICES)
+    print(f"{GREEN}Wrote{RESET} {len(files)} files ({counts}) to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
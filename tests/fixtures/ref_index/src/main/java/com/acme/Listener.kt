@@ -0,0 +1,13 @@
+package com.acme
+
+@Component
+class Listener(private val service: OrderService) {
+    @KafkaListener(topics = ["orders"])
+    fun onMessage(msg: String) = service.find(msg)
+
+    fun unusedKotlin(): Int = 1
+}
+
+object Registry
+
+fun topLevelHelper() = Listener::class
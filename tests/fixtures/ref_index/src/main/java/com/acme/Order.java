@@ -0,0 +1,7 @@
+package com.acme;
+
+public record Order(String id, long createdAt, Object status) {
+    public Order {
+        Objects.requireNonNull(id);
+    }
+}
@@ -0,0 +1,21 @@
+package com.acme;
+
+@RestController
+@RequestMapping("/orders")
+public class OrderController {
+    private final OrderService orderService;
+
+    public OrderController(OrderService orderService) {
+        this.orderService = orderService;
+    }
+
+    @GetMapping("/{id}")
+    public Order get(@PathVariable("id") String id) {
+        return orderService.find(id);
+    }
+
+    @RequestMapping(value = "/bulk", method = RequestMethod.POST)
+    public List<Order> bulk(@RequestBody List<Order> orders) throws IOException {
+        return orders;
+    }
+}
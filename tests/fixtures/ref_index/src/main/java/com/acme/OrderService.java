@@ -0,0 +1,41 @@
+package com.acme;
+
+import java.util.List;
+
+@Service
+public class OrderService {
+    private final Clock clock;
+
+    public OrderService(Clock clock) {
+        this.clock = clock;
+    }
+
+    Order find(String id) {
+        // legacyHelper() and "UnusedThing" in a comment are not references
+        return new Order(id, new Helper().stamp(clock), Status.OPEN);
+    }
+
+    private String legacyHelper() {
+        return "x";
+    }
+
+    Object plugin() throws Exception {
+        return Class.forName("com.acme.PluginImpl").getMethod("start");
+    }
+
+    private static class Helper {
+        Helper() {
+        }
+
+        long stamp(Clock clock) {
+            return clock.millis();
+        }
+    }
+
+    enum Status { OPEN, CLOSED }
+
+    static class Orphaned {
+        Orphaned() {
+        }
+    }
+}
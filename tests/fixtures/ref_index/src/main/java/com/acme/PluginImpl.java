@@ -0,0 +1,6 @@
+package com.acme;
+
+public class PluginImpl {
+    public void start() {
+    }
+}
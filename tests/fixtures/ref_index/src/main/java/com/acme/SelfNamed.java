@@ -0,0 +1,11 @@
+package com.acme;
+
+/** Only ever named by its own constructors. */
+public class SelfNamed {
+    public SelfNamed() {
+        this(0);
+    }
+
+    public SelfNamed(int seed) throws IllegalStateException {
+    }
+}
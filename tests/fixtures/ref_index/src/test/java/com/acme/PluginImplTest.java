@@ -0,0 +1,8 @@
+package com.acme;
+
+class PluginImplTest {
+    @Test
+    void starts() {
+        new PluginImpl().start();
+    }
+}
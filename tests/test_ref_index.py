@@ -0,0 +1,190 @@
+"""Fixture tests for the dead-code-audit reference indexer's parsing heuristics.
+
+    python3 -m unittest discover tests
+
+The fixture project in ``fixtures/ref_index`` is a small Spring service.
+The assertions pin down the verdicts the regexes drive: what counts as a
+declaration, an entry point or a reference, and what ``--unreferenced``
+reports.
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "ref_index"
+SCRIPT = REPO_ROOT / "claude" / ".claude" / "skills" / "dead-code-audit" / "lib" / "ref_index.py"
+
+spec = importlib.util.spec_from_file_location("ref_index", SCRIPT)
+ref_index = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(ref_index)
+
+
+def run(*argv):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        ref_index.main([str(arg) for arg in argv])
+    return out.getvalue()
+
+
+def query(root, *argv):
+    return json.loads(run("--root", root, "query", *argv, "--json"))
+
+
+def parse(relative):
+    path = FIXTURE / relative
+    return ref_index.parse_source(path, path.read_text(encoding="utf-8"))
+
+
+class ParseSourceTest(unittest.TestCase):
+    def test_nested_types_are_qualified_by_their_outer_type(self):
+        decls, _ = parse("src/main/java/com/acme/OrderService.java")
+        fqns = {d["fqn"] for d in decls if d["kind"] == "class"}
+        self.assertEqual(fqns, {
+            "com.acme.OrderService",
+            "com.acme.OrderService.Helper",
+            "com.acme.OrderService.Status",
+            "com.acme.OrderService.Orphaned",
+        })
+
+    def test_methods_belong_to_the_innermost_enclosing_type(self):
+        decls, _ = parse("src/main/java/com/acme/OrderService.java")
+        owners = {d["name"]: d["fqn"] for d in decls if d["kind"] == "method"}
+        self.assertEqual(owners["stamp"], "com.acme.OrderService.Helper.stamp")
+        self.assertEqual(owners["plugin"], "com.acme.OrderService.plugin")
+
+    def test_constructor_declarations_are_not_references(self):
+        _, refs = parse("src/main/java/com/acme/SelfNamed.java")
+        # Only the declaration line itself, which queries skip
+        self.assertEqual({line for name, line, _ in refs if name == "SelfNamed"}, {4})
+
+    def test_new_and_compact_record_constructors(self):
+        _, refs = parse("src/main/java/com/acme/OrderService.java")
+        self.assertIn(("Helper", 15, "code"), refs)
+        _, refs = parse("src/main/java/com/acme/Order.java")
+        self.assertNotIn("Order", {name for name, line, _ in refs if line == 4})
+
+    def test_comments_are_not_references(self):
+        _, refs = parse("src/main/java/com/acme/OrderService.java")
+        self.assertNotIn("UnusedThing", {name for name, _, _ in refs})
+        self.assertEqual({line for name, line, _ in refs if name == "legacyHelper"}, {18})
+
+    def test_reflection_hints(self):
+        _, refs = parse("src/main/java/com/acme/OrderService.java")
+        self.assertIn(("PluginImpl", 23, "reflection"), refs)
+        self.assertIn(("start", 23, "reflection"), refs)
+
+    def test_endpoints_combine_class_and_method_mappings(self):
+        decls, _ = parse("src/main/java/com/acme/OrderController.java")
+        endpoints = {d["name"]: d["endpoint"] for d in decls if d["endpoint"]}
+        self.assertEqual(endpoints, {"get": "GET /orders/{id}", "bulk": "POST /orders/bulk"})
+
+    def test_kotlin_annotations_do_not_leak_to_the_next_member(self):
+        decls, _ = parse("src/main/java/com/acme/Listener.kt")
+        entry = {d["name"]: d["entry_point"] for d in decls}
+        self.assertTrue(entry["onMessage"])
+        self.assertFalse(entry["unusedKotlin"])
+        self.assertFalse(entry["Registry"])
+
+    def test_kotlin_bodyless_object_does_not_own_later_functions(self):
+        decls, _ = parse("src/main/java/com/acme/Listener.kt")
+        fqns = {d["name"]: d["fqn"] for d in decls}
+        self.assertEqual(fqns["topLevelHelper"], "com.acme.topLevelHelper")
+
+
+class IndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.root = self.tmp / "svc"
+        shutil.copytree(FIXTURE, self.root)
+        run("--root", self.root, "build", "--jobs", "1")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_unreferenced(self):
+        found = {d["fqn"] for d in query(self.root, "--unreferenced")}
+        self.assertEqual(found, {
+            "com.acme.OrderService.legacyHelper",
+            "com.acme.OrderService.plugin",
+            "com.acme.OrderService.Orphaned",
+            "com.acme.SelfNamed",
+            "com.acme.Listener.unusedKotlin",
+            "com.acme.Registry",
+            "com.acme.topLevelHelper",
+        })
+
+    def test_qualified_query_matches_nested_type(self):
+        result = query(self.root, "com.acme.OrderService.Helper")
+        self.assertEqual([d["line"] for d in result["declarations"]], [26])
+        self.assertEqual([r["line"] for r in result["references"]], [15])
+
+    def test_resource_reference(self):
+        result = query(self.root, "AutoConfig")
+        self.assertEqual([r["kind"] for r in result["references"]], ["resource"])
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class UpdateTest(unittest.TestCase):
+    """``--root`` below the git top level, as for one service in a monorepo."""
+
+    def setUp(self):
+        self.repo = Path(tempfile.mkdtemp())
+        self.root = self.repo / "services" / "orders"
+        shutil.copytree(FIXTURE, self.root)
+        self.git("init", "-q")
+        self.commit("initial")
+        run("--root", self.root, "build", "--jobs", "1")
+
+    def tearDown(self):
+        shutil.rmtree(self.repo)
+
+    def git(self, *args):
+        subprocess.run(["git", *args], cwd=self.repo, check=True, capture_output=True)
+
+    def commit(self, message):
+        self.git("add", "-A")
+        self.git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", message)
+
+    def test_committed_rename_under_subdirectory_root(self):
+        source = self.root / "src/main/java/com/acme/OrderService.java"
+        source.write_text(source.read_text().replace("legacyHelper", "renamedHelper"))
+        self.commit("rename")
+
+        run("--root", self.root, "update", "--jobs", "1")
+
+        self.assertEqual(len(query(self.root, "renamedHelper")["declarations"]), 1)
+        self.assertEqual(query(self.root, "legacyHelper")["declarations"], [])
+
+    def test_untracked_path_with_spaces(self):
+        spaced = self.root / "src/main/java/com/acme/odd dir/Spaced Name.java"
+        spaced.parent.mkdir()
+        spaced.write_text("package com.acme;\n\npublic class Spaced {\n}\n")
+
+        run("--root", self.root, "update", "--jobs", "1")
+
+        [decl] = query(self.root, "Spaced")["declarations"]
+        self.assertEqual(decl["file"], "src/main/java/com/acme/odd dir/Spaced Name.java")
+
+    def test_reverted_dirty_file_is_reindexed(self):
+        source = self.root / "src/main/java/com/acme/PluginImpl.java"
+        original = source.read_text()
+        source.write_text(original.replace("start", "begin"))
+        run("--root", self.root, "update", "--jobs", "1")
+        source.write_text(original)
+
+        run("--root", self.root, "update", "--jobs", "1")
+
+        self.assertEqual(len(query(self.root, "start")["declarations"]), 1)
+        self.assertEqual(query(self.root, "begin")["declarations"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
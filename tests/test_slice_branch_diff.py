@@ -0,0 +1,105 @@
+"""Tests for slice-branch-diff.py against a throwaway git repository.
+
+    python3 -m unittest discover tests
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "slice-branch-diff.py"
+
+spec = importlib.util.spec_from_file_location("slice_branch_diff", SCRIPT)
+slice_branch_diff = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(slice_branch_diff)
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class SliceBranchDiffTest(unittest.TestCase):
+    def setUp(self):
+        self.repo = Path(tempfile.mkdtemp())
+        self.out = self.repo / ".review"
+        self.cwd = os.getcwd()
+        os.chdir(self.repo)
+        self.git("init", "-q")
+        self.git("checkout", "-q", "-b", "main")
+        self.write("src/main/java/x/A.java", "class A {\n    int a() { return 1; }\n}\n")
+        self.write("src/main/java/x/Old.java", "one\ntwo\nthree\nfour\nfive\n")
+        self.commit("base")
+        self.git("checkout", "-q", "-b", "feature")
+        self.write("src/main/java/x/A.java", "class A {\n    int a() { return 2; }\n}\n")
+        self.git("mv", "src/main/java/x/Old.java", "src/main/java/x/New.java")
+        self.write("db/migration/V1__init.sql", "create table t (id int);\n")
+        self.write("src/test/java/x/ATest.java", "class ATest {}\n")
+        self.write("docs/odd dir/read me.md", "hi\n")
+        self.commit("feature")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.repo)
+
+    def git(self, *args):
+        subprocess.run(["git", *args], check=True, capture_output=True)
+
+    def write(self, relative, text):
+        path = self.repo / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+    def commit(self, message):
+        self.git("add", "-A")
+        self.git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", message)
+
+    def run_script(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return slice_branch_diff.main(list(argv))
+
+    def test_slices_partition_the_diff(self):
+        self.assertEqual(self.run_script("--base=main", f"--out={self.out}"), 0)
+
+        index = json.loads((self.out / "index.json").read_text())
+        slices = {f["path"]: f["slice"] for f in index["files"]}
+        self.assertEqual(slices, {
+            "db/migration/V1__init.sql": "sql",
+            "docs/odd dir/read me.md": "production",
+            "src/main/java/x/A.java": "production",
+            "src/main/java/x/New.java": "production",
+            "src/test/java/x/ATest.java": "tests",
+        })
+        self.assertEqual((self.out / "slices" / "tests.files.txt").read_text(), "src/test/java/x/ATest.java\n")
+        slice_bytes = sum(len((self.out / "slices" / f"{name}.diff").read_bytes()) for name in slice_branch_diff.SLICES)
+        self.assertEqual(slice_bytes, len((self.out / "diff.txt").read_bytes()))
+
+    def test_hunk_offsets_and_line_ranges_point_into_diff(self):
+        self.run_script("--base=main", f"--out={self.out}")
+
+        diff = (self.out / "diff.txt").read_bytes()
+        lines = diff.splitlines(keepends=True)
+        index = json.loads((self.out / "index.json").read_text())
+        for f in index["files"]:
+            self.assertTrue(diff[f["offset"]:f["offset"] + f["length"]].startswith(b"diff --git "))
+            for hunk in f["hunks"]:
+                text = diff[hunk["offset"]:hunk["offset"] + hunk["length"]]
+                self.assertTrue(text.startswith(b"@@ "))
+                self.assertEqual(b"".join(lines[hunk["line"] - 1:hunk["line"] - 1 + hunk["line_count"]]), text)
+
+    def test_rename_keeps_old_path(self):
+        self.run_script("--base=main", f"--out={self.out}")
+
+        [renamed] = [f for f in json.loads((self.out / "index.json").read_text())["files"] if f["status"] == "renamed"]
+        self.assertEqual(renamed["old_path"], "src/main/java/x/Old.java")
+
+    def test_unknown_base_fails(self):
+        self.assertEqual(self.run_script("--base=no-such-branch", f"--out={self.out}"), 1)
+        self.assertFalse(self.out.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
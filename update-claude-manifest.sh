@@ -0,0 +1,99 @@
+#!/bin/bash
+set -e
+
+# Rewrite the checksums in claude-manifest.txt from the files under
+# claude/.claude/. Run after changing any installed file, then commit both.
+#
+#   ./update-claude-manifest.sh          rewrite checksums
+#   ./update-claude-manifest.sh --check  exit 1 if the manifest is stale
+
+cd "$(dirname "$0")"
+
+MANIFEST="claude-manifest.txt"
+SOURCE="claude/.claude"
+
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+RESET='\033[0m'
+
+error() {
+    printf "${RED}[ERROR]${RESET} %s\n" "$1" >&2
+}
+
+CHECK=false
+
+for arg in "$@"; do
+    case "$arg" in
+        --check)
+            CHECK=true
+            ;;
+        *)
+            error "Unknown flag: $arg"
+            exit 1
+            ;;
+    esac
+done
+
+file_sha256() {
+    if command -v sha256sum >/dev/null 2>&1; then
+        sha256sum "$1" | cut -d' ' -f1
+    else
+        shasum -a 256 "$1" | cut -d' ' -f1
+    fi
+}
+
+tmp="$(mktemp)"
+listed="$(mktemp)"
+trap 'rm -f "$tmp" "$listed"' EXIT
+
+STALE=0
+
+while IFS= read -r line; do
+    case "$line" in
+        ''|'#'*)
+            printf '%s\n' "$line" >> "$tmp"
+            continue
+            ;;
+    esac
+
+    # Split on any whitespace, the same way install-claude.sh reads the manifest
+    read -r checksum path <<< "$line"
+    printf '%s\n' "$path" >> "$listed"
+
+    if [ ! -f "${SOURCE}/${path}" ]; then
+        error "Listed in ${MANIFEST} but missing: ${SOURCE}/${path}"
+        if [ "$CHECK" = true ]; then
+            STALE=1
+            continue
+        fi
+        exit 1
+    fi
+
+    actual="$(file_sha256 "${SOURCE}/${path}")"
+    if [ "$CHECK" = true ] && [ "$checksum" != "$actual" ]; then
+        error "Checksum out of date: $path"
+        STALE=1
+    fi
+    printf '%s  %s\n' "$actual" "$path" >> "$tmp"
+done < "$MANIFEST"
+
+if [ "$CHECK" = true ]; then
+    # Files that exist but would never be installed
+    while IFS= read -r path; do
+        path="${path#"${SOURCE}"/}"
+        if ! grep -qxF "$path" "$listed"; then
+            error "Not listed in ${MANIFEST}: ${SOURCE}/${path}"
+            STALE=1
+        fi
+    done < <(find "$SOURCE" -type f ! -path '*/__pycache__/*' ! -name '*.pyc' ! -name '.DS_Store' 2>/dev/null | sort)
+
+    if [ "$STALE" -ne 0 ]; then
+        error "${MANIFEST} is stale; add missing paths and run ./update-claude-manifest.sh"
+        exit 1
+    fi
+    printf "${GREEN}Up to date${RESET} %s\n" "$MANIFEST"
+    exit 0
+fi
+
+mv "$tmp" "$MANIFEST"
+printf "${GREEN}Updated${RESET} %s\n" "$MANIFEST"